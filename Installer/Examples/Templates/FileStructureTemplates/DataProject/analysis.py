@@ -11,39 +11,88 @@ import os
 import sys
 import json
 import csv
+import errno
 import hashlib
+import heapq
+import importlib.util
 import mimetypes
+import mmap
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from collections import defaultdict, Counter
-from typing import Dict, List, Tuple, Any, Optional, Generator
-from dataclasses import dataclass, asdict
+from collections import defaultdict, Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Any, Optional, Generator, Iterable
+from dataclasses import dataclass
 from enum import Enum
+from itertools import islice, repeat
+from operator import itemgetter
 import statistics
 import math
+from array import array
 
 # Optional imports with fallbacks
+# Heavy modules are only checked for here and imported where they are used
+PANDAS_AVAILABLE = importlib.util.find_spec('pandas') is not None
+if not PANDAS_AVAILABLE:
+    print("Warning: pandas not installed. Some features will be limited.")
+
+# matplotlib is slow to import, so create_visualizations loads it on first use
+MATPLOTLIB_AVAILABLE = importlib.util.find_spec('matplotlib') is not None
+if not MATPLOTLIB_AVAILABLE:
+    print("Warning: matplotlib not installed. Visualization features disabled.")
+
+NUMPY_AVAILABLE = importlib.util.find_spec('numpy') is not None
+if not NUMPY_AVAILABLE:
+    print("Warning: numpy not installed. Some statistical functions limited.")
+np = None  # Bound by _numpy() on first use
+
+def _numpy():
+    """Import NumPy on first use (callers check NUMPY_AVAILABLE first)"""
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+# Accelerators only: fall back silently, the backend in use is reported where it matters
 try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
+    import xxhash
+    XXHASH_AVAILABLE = True
 except ImportError:
-    PANDAS_AVAILABLE = False
-    print("Warning: pandas not installed. Some features will be limited.")
+    XXHASH_AVAILABLE = False
 
 try:
-    import matplotlib.pyplot as plt
-    MATPLOTLIB_AVAILABLE = True
+    import blake3
+    BLAKE3_AVAILABLE = True
 except ImportError:
-    MATPLOTLIB_AVAILABLE = False
-    print("Warning: matplotlib not installed. Visualization features disabled.")
+    BLAKE3_AVAILABLE = False
 
 try:
-    import numpy as np
-    NUMPY_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    NUMPY_AVAILABLE = True
-    print("Warning: numpy not installed. Some statistical functions limited.")
+    ORJSON_AVAILABLE = False
+
+# Name of the fast fingerprint, recorded so cached values from another algorithm are never reused.
+# Large files use multithreaded BLAKE3 when it is installed.
+FAST_HASH_NAME = 'xxh3_64' if XXHASH_AVAILABLE else 'blake2b_64'
+if BLAKE3_AVAILABLE:
+    FAST_HASH_NAME += '+blake3_128'
+
+# hashlib normally links OpenSSL, which picks SHA-NI/AVX2 code paths at runtime.
+# Pythons built without it can still reach OpenSSL through the cryptography package.
+OPENSSL_HASHLIB = hashlib.sha256.__name__.startswith('openssl_')
+CRYPTOGRAPHY_HASHES = {}
+if not OPENSSL_HASHLIB:
+    try:
+        from cryptography.hazmat.primitives import hashes as crypto_hashes
+        CRYPTOGRAPHY_HASHES = {'md5': crypto_hashes.MD5, 'sha256': crypto_hashes.SHA256}
+    except ImportError:
+        pass
+
+# O_NOATIME is only permitted on files owned by the effective user, or on any file for root
+EUID = os.geteuid() if hasattr(os, 'geteuid') else None
 
 # ==================== Enums and Data Classes ====================
 
@@ -67,6 +116,10 @@ class AnalysisMode(Enum):
     DETAILED = "detailed"
     DEEP = "deep"
 
+# Small integer ids for file types, used by the columnar file table
+FILE_TYPES = list(FileType)
+FILE_TYPE_IDS = {file_type: i for i, file_type in enumerate(FILE_TYPES)}
+
 @dataclass
 class FileStats:
     """Statistics for a single file"""
@@ -81,21 +134,38 @@ class FileStats:
     mime_type: str = ""
     hash_md5: str = ""
     hash_sha256: str = ""
+    fast_hash: str = ""
     line_count: int = 0
     word_count: int = 0
     char_count: int = 0
     permissions: int = 0o644
     owner: str = ""
     group: str = ""
+    uid: int = -1  # Numeric owner, decides whether reads may use O_NOATIME
     
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
-        data = asdict(self)
-        data['file_type'] = self.file_type.value
-        data['created'] = datetime.fromtimestamp(self.created).isoformat()
-        data['modified'] = datetime.fromtimestamp(self.modified).isoformat()
-        data['accessed'] = datetime.fromtimestamp(self.accessed).isoformat()
-        return data
+        # Direct attribute reads; asdict() re-inspects the dataclass on every call
+        return {
+            'path': self.path,
+            'name': self.name,
+            'size': self.size,
+            'file_type': self.file_type.value,
+            'extension': self.extension,
+            'created': datetime.fromtimestamp(self.created).isoformat(),
+            'modified': datetime.fromtimestamp(self.modified).isoformat(),
+            'accessed': datetime.fromtimestamp(self.accessed).isoformat(),
+            'mime_type': self.mime_type,
+            'hash_md5': self.hash_md5,
+            'hash_sha256': self.hash_sha256,
+            'fast_hash': self.fast_hash,
+            'line_count': self.line_count,
+            'word_count': self.word_count,
+            'char_count': self.char_count,
+            'permissions': self.permissions,
+            'owner': self.owner,
+            'group': self.group
+        }
 
 @dataclass
 class DirectoryStats:
@@ -111,6 +181,7 @@ class DirectoryStats:
     oldest_file: Tuple[str, float] = ("", 0.0)
     newest_file: Tuple[str, float] = ("", 0.0)
     file_types: Dict[str, int] = None
+    file_type_sizes: Dict[str, int] = None
     extensions: Dict[str, int] = None
     depth: int = 0
     owner_stats: Dict[str, int] = None
@@ -118,6 +189,8 @@ class DirectoryStats:
     def __post_init__(self):
         if self.file_types is None:
             self.file_types = defaultdict(int)
+        if self.file_type_sizes is None:
+            self.file_type_sizes = defaultdict(int)
         if self.extensions is None:
             self.extensions = defaultdict(int)
         if self.owner_stats is None:
@@ -125,12 +198,24 @@ class DirectoryStats:
     
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
-        data = asdict(self)
-        # Convert defaultdict to regular dict
-        data['file_types'] = dict(self.file_types)
-        data['extensions'] = dict(self.extensions)
-        data['owner_stats'] = dict(self.owner_stats)
-        return data
+        # Built by hand: asdict() cannot copy the defaultdict counters
+        return {
+            'path': self.path,
+            'total_files': self.total_files,
+            'total_dirs': self.total_dirs,
+            'total_size': self.total_size,
+            'avg_file_size': self.avg_file_size,
+            'median_file_size': self.median_file_size,
+            'largest_file': list(self.largest_file),
+            'smallest_file': list(self.smallest_file),
+            'oldest_file': list(self.oldest_file),
+            'newest_file': list(self.newest_file),
+            'file_types': dict(self.file_types),
+            'file_type_sizes': dict(self.file_type_sizes),
+            'extensions': dict(self.extensions),
+            'depth': self.depth,
+            'owner_stats': dict(self.owner_stats)
+        }
 
 @dataclass
 class DuplicateFile:
@@ -139,9 +224,94 @@ class DuplicateFile:
     size: int
     files: List[str]
     count: int = 0
+    copies: int = 0  # Distinct inodes; hard links to one inode are a single copy
     
     def __post_init__(self):
         self.count = len(self.files)
+        if not self.copies:
+            self.copies = self.count
+
+@dataclass
+class FileRec:
+    """Metadata for one regular file, captured once during the walk"""
+    __slots__ = ('name', 'path', 'size', 'mtime', 'ctime', 'atime', 'dev', 'ino', 'nlink', 'uid')
+    name: str
+    path: str
+    size: int
+    mtime: float
+    ctime: float
+    atime: float
+    dev: int
+    ino: int
+    nlink: int
+    uid: int
+
+class CryptographyHash:
+    """hashlib-style wrapper around a cryptography hash context"""
+    
+    def __init__(self, algorithm: str):
+        self._context = crypto_hashes.Hash(CRYPTOGRAPHY_HASHES[algorithm]())
+    
+    def update(self, data):
+        self._context.update(data)
+    
+    def hexdigest(self) -> str:
+        return self._context.finalize().hex()
+
+class Blake3Hash:
+    """hashlib-style wrapper around a multithreaded BLAKE3 hasher with a truncated digest"""
+    
+    def __init__(self, digest_size: int = 16):
+        self._hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        self.digest_size = digest_size
+    
+    def update(self, data):
+        self._hasher.update(data)
+    
+    def hexdigest(self) -> str:
+        return self._hasher.hexdigest(length=self.digest_size)
+
+class FileTable:
+    """Columnar (structure-of-arrays) storage for the per-file values every mode keeps"""
+    
+    def __init__(self):
+        self.paths: List[str] = []
+        self.sizes = array('q')      # int64
+        self.mtimes = array('d')     # float64
+        self.ctimes = array('d')
+        self.atimes = array('d')
+        self.type_ids = array('b')   # int8, index into FILE_TYPES
+        self.ext_ids = array('i')    # int32, index into ext_names
+        self.ext_names: List[str] = []
+        self._ext_index: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self.paths)
+    
+    def extend(self, records: List[FileRec], extensions: List[str], type_ids: List[int]):
+        """Add a batch of files to every column"""
+        self.paths.extend([rec.path for rec in records])
+        self.sizes.extend([rec.size for rec in records])
+        self.mtimes.extend([rec.mtime for rec in records])
+        self.ctimes.extend([rec.ctime for rec in records])
+        self.atimes.extend([rec.atime for rec in records])
+        self.type_ids.extend(type_ids)
+        
+        # Each distinct extension is stored once and referenced by id
+        ext_index = self._ext_index
+        for extension in extensions:
+            ext_id = ext_index.get(extension)
+            if ext_id is None:
+                ext_id = ext_index[extension] = len(self.ext_names)
+                self.ext_names.append(extension)
+            self.ext_ids.append(ext_id)
+    
+    def column(self, name: str):
+        """Return a column as a zero-copy NumPy view (plain array without NumPy)"""
+        values = getattr(self, name)
+        if NUMPY_AVAILABLE:
+            return _numpy().frombuffer(values, dtype=values.typecode)
+        return values
 
 # ==================== File Analyzer Class ====================
 
@@ -159,76 +329,192 @@ class FileSystemAnalyzer:
     EXECUTABLE_EXTENSIONS = {'.exe', '.dll', '.so', '.dylib', '.sh', '.bat', '.cmd', '.app', '.msi'}
     SYSTEM_EXTENSIONS = {'.sys', '.dll', '.drv', '.vxd', '.ocx', '.cpl', '.tmp', '.temp', '.log', '.bak'}
     
-    def __init__(self, root_path: str, mode: AnalysisMode = AnalysisMode.STANDARD):
+    # Single-lookup extension map; earlier categories win ('.log' is Text, '.dll' is Executable)
+    _EXT_MAP = {
+        extension: file_type
+        for extensions, file_type in reversed((
+            (TEXT_EXTENSIONS, FileType.TEXT),
+            (IMAGE_EXTENSIONS, FileType.IMAGE),
+            (VIDEO_EXTENSIONS, FileType.VIDEO),
+            (AUDIO_EXTENSIONS, FileType.AUDIO),
+            (ARCHIVE_EXTENSIONS, FileType.ARCHIVE),
+            (DOCUMENT_EXTENSIONS, FileType.DOCUMENT),
+            (CODE_EXTENSIONS, FileType.CODE),
+            (EXECUTABLE_EXTENSIONS, FileType.EXECUTABLE),
+            (SYSTEM_EXTENSIONS, FileType.SYSTEM),
+        ))
+        for extension in extensions
+    }
+    _EXT_TYPE_IDS = {extension: FILE_TYPE_IDS[file_type] for extension, file_type in _EXT_MAP.items()}
+    
+    # Hashing parameters
+    MMAP_THRESHOLD = 10 * 1024 * 1024  # Files this large are hashed via mmap
+    HASH_CHUNK_SIZE = 256 * 1024       # Read size for unbuffered hashing; large enough to release the GIL
+    HASH_WORKERS = min(32, (os.cpu_count() or 1) * 4)  # Hashing is I/O-bound, so oversubscribe
+    HASH_BATCH_SIZE = 1024             # Max tasks queued on the hash pool at once
+    FILES_PER_TASK = 16                # Small files hashed back-to-back per pool task
+    PREFIX_SIZE = 4096                 # Leading bytes compared before a full hash
+    BLAKE3_THRESHOLD = 8 * 1024 * 1024  # Files this large get a multithreaded BLAKE3 fingerprint
+    
+    SCAN_BATCH_SIZE = 10000            # Files categorized per batch during the walk
+    WALK_WORKERS = min(32, (os.cpu_count() or 1) * 4)  # Directory readers in detailed/deep mode
+    PROGRESS_INTERVAL = 1.0            # Minimum seconds between progress lines
+    
+    HASH_CACHE_NAME = '.fmp_hash_cache.sqlite'  # Default hash cache file inside the root
+    
+    COUNT_CHUNK_SIZE = 4 * 1024 * 1024  # Window size for line/word counting
+    UTF8_CONTINUATION_BYTES = bytes(range(0x80, 0xc0))  # Not counted as characters
+    ASCII_WHITESPACE = b' \t\n\r\x0b\x0c'
+    
+    _MIME_MAP: Optional[Dict[str, str]] = None  # Built on first use, see _get_mime_map()
+    
+    def __init__(self, root_path: str, mode: AnalysisMode = AnalysisMode.STANDARD,
+                 integrity_hashes: bool = False, hash_cache: Optional[str] = None,
+                 cross_device: bool = False, use_statx: bool = False):
         """
         Initialize analyzer
         
         Args:
             root_path: Root directory to analyze
             mode: Analysis mode (quick, standard, detailed, deep)
+            integrity_hashes: Also compute MD5/SHA-256 for every hashed file
+            hash_cache: SQLite file used to reuse hashes of unchanged files across runs
+            cross_device: Descend into directories on other filesystems (mount points)
+            use_statx: Stat files with statx(AT_STATX_DONT_SYNC), for network filesystems
         """
         self.root_path = Path(root_path).resolve()
         self.mode = mode
         self.stats = DirectoryStats(path=str(self.root_path))
         self.files_data: List[FileStats] = []
+        self.sampled = False  # Set when quick mode stops at its sample limits
+        self.skipped_mounts: List[str] = []  # Directories on other filesystems left out of the scan
+        self.table = FileTable()
         self.duplicates: List[DuplicateFile] = []
+        self._dup_sizes = array('q')   # Per duplicate group, parallel to self.duplicates
+        self._dup_counts = array('q')
+        self._inode_to_paths = defaultdict(list)  # (st_dev, st_ino) -> files_data indices, hard links only
         self.errors: List[Tuple[str, str]] = []
+        # Resolved like root_path, so the walk can recognize the cache file and skip it
+        self.hash_cache_path = os.path.realpath(hash_cache) if hash_cache else None
+        self._hash_cache = None  # sqlite3.Connection while a run uses the cache
+        
+        # Traversal stays on the root's filesystem and enters each directory once
+        self.cross_device = cross_device
+        self.use_statx = use_statx
+        self._fast_stat = None
+        self._statx_available = None
+        if use_statx:
+            # Only --statx runs need the ctypes helpers
+            from _platform_stat import fast_stat, statx_available
+            self._fast_stat = fast_stat
+            self._statx_available = statx_available
+        self._visited_inodes = set()
+        try:
+            root_stat = os.stat(self.root_path)
+            self._root_dev = root_stat.st_dev
+            self._visited_inodes.add((root_stat.st_dev, root_stat.st_ino))
+        except OSError:
+            self._root_dev = None
         
         # Configuration based on mode
         self.config = {
             AnalysisMode.QUICK: {
                 'hash_files': False,
+                'integrity_hashes': False,
                 'count_lines': False,
+                'mime_types': False,
                 'check_duplicates': False,
                 'max_depth': 3,
+                'max_files': 50_000,  # Sample limits: stop scanning early
+                'max_seconds': 2.0,
                 'skip_hidden': True,
-                'skip_system': True
+                'skip_system': True,
+                'file_records': False  # Table columns only; nothing reads per-file FileStats
             },
             AnalysisMode.STANDARD: {
                 'hash_files': True,
+                'integrity_hashes': False,
                 'count_lines': True,
+                'mime_types': True,
                 'check_duplicates': True,
                 'max_depth': 10,
+                'max_files': None,
+                'max_seconds': None,
                 'skip_hidden': True,
-                'skip_system': True
+                'skip_system': True,
+                'file_records': True
             },
             AnalysisMode.DETAILED: {
                 'hash_files': True,
+                'integrity_hashes': False,
                 'count_lines': True,
+                'mime_types': True,
                 'check_duplicates': True,
                 'max_depth': 20,
+                'max_files': None,
+                'max_seconds': None,
                 'skip_hidden': False,
-                'skip_system': False
+                'skip_system': False,
+                'file_records': True
             },
             AnalysisMode.DEEP: {
                 'hash_files': True,
+                'integrity_hashes': False,
                 'count_lines': True,
+                'mime_types': True,
                 'check_duplicates': True,
                 'max_depth': None,  # Unlimited
+                'max_files': None,
+                'max_seconds': None,
                 'skip_hidden': False,
-                'skip_system': False
+                'skip_system': False,
+                'file_records': True
             }
         }
         
         self.current_config = self.config[self.mode]
+        if integrity_hashes:
+            self.current_config['integrity_hashes'] = True
     
     def analyze(self) -> DirectoryStats:
         """Perform comprehensive analysis of file system"""
         print(f"Starting analysis of: {self.root_path}")
         print(f"Mode: {self.mode.value}")
+        if self.current_config['check_duplicates']:
+            print(f"Fingerprint: {FAST_HASH_NAME}")
+        if self.current_config['integrity_hashes']:
+            print(f"Hash backend: {self._hash_backend()}")
         print("-" * 60)
         
         start_time = time.time()
         
-        # Collect file statistics
-        self._collect_file_stats()
+        integrity = self.current_config['hash_files'] and self.current_config['integrity_hashes']
         
-        # Calculate derived statistics
-        self._calculate_statistics()
+        # The cache is only worth creating when this run hashes anything
+        if self.hash_cache_path and (integrity or self.current_config['check_duplicates']):
+            self._open_hash_cache()
         
-        # Find duplicates if enabled
-        if self.current_config['check_duplicates']:
-            self._find_duplicates()
+        try:
+            # Collect file statistics
+            self._collect_file_stats()
+            
+            # Integrity hashes cover every file (once per hard-linked inode);
+            # duplicate detection hashes its own candidates
+            if integrity:
+                link_groups = self._hardlink_groups()
+                linked = {id(f) for group in link_groups for f in group[1:]}
+                self._hash_files([f for f in self.files_data if id(f) not in linked], integrity=True)
+                self._copy_hashes_to_links(link_groups)
+            
+            # Calculate derived statistics
+            self._calculate_statistics()
+            
+            # Find duplicates if enabled
+            if self.current_config['check_duplicates']:
+                self._find_duplicates()
+        finally:
+            if self._hash_cache is not None:
+                self._close_hash_cache()
         
         # Generate reports
         self._generate_reports()
@@ -238,101 +524,44 @@ class FileSystemAnalyzer:
         print(f"Files processed: {self.stats.total_files}")
         print(f"Directories found: {self.stats.total_dirs}")
         print(f"Total size: {self._format_size(self.stats.total_size)}")
+        if self.sampled:
+            print("Note: scan stopped at the quick-mode sample limit; totals cover the scanned part only")
+        if self.skipped_mounts:
+            print(f"Note: skipped {len(self.skipped_mounts)} directories on other filesystems "
+                  f"(e.g. {self.skipped_mounts[0]}); use --cross-device to include them")
+        if self.use_statx and not self._statx_available():
+            print("Note: statx() is not available on this system; --statx fell back to os.stat")
         
         return self.stats
     
     def _collect_file_stats(self):
         """Collect statistics by walking directory tree"""
-        file_count = 0
-        dir_count = 0
-        total_size = 0
-        file_sizes = []
-        file_times = []
+        batch = []
+        last_progress = time.monotonic()
         
-        max_depth = self.current_config['max_depth']
-        skip_hidden = self.current_config['skip_hidden']
-        skip_system = self.current_config['skip_system']
+        # Deeper modes overlap directory reads across a thread pool;
+        # quick mode stops once it has seen a sample of the tree
+        if self.mode in (AnalysisMode.DETAILED, AnalysisMode.DEEP):
+            records = self._parallel_walk(str(self.root_path))
+        else:
+            records = self._walk(str(self.root_path),
+                                 self.current_config['max_files'],
+                                 self.current_config['max_seconds'])
         
         try:
-            for root, dirs, files in os.walk(self.root_path, topdown=True):
-                # Calculate current depth
-                current_depth = len(Path(root).relative_to(self.root_path).parts)
-                
-                # Apply depth limit
-                if max_depth is not None and current_depth > max_depth:
-                    dirs.clear()  # Don't recurse deeper
-                    continue
+            for record in records:
+                batch.append(record)
                 
-                # Filter hidden/system directories
-                if skip_hidden or skip_system:
-                    dirs[:] = [d for d in dirs if not self._is_hidden_or_system(Path(root) / d)]
+                # Per-file work is done a batch at a time
+                if len(batch) >= self.SCAN_BATCH_SIZE:
+                    self._process_batch(batch)
+                    batch = []
                 
-                # Process directories
-                for dir_name in dirs:
-                    dir_path = Path(root) / dir_name
-                    dir_count += 1
-                
-                # Process files
-                for file_name in files:
-                    file_path = Path(root) / file_name
-                    
-                    # Skip hidden/system files
-                    if (skip_hidden and file_name.startswith('.')) or \
-                       (skip_system and self._is_system_file(file_path)):
-                        continue
-                    
-                    try:
-                        stat = file_path.stat()
-                        size = stat.st_size
-                        
-                        # Get file type
-                        extension = file_path.suffix.lower()
-                        file_type = self._categorize_file(extension, file_path)
-                        
-                        # Basic file stats
-                        file_stat = FileStats(
-                            path=str(file_path),
-                            name=file_name,
-                            size=size,
-                            file_type=file_type,
-                            extension=extension,
-                            created=stat.st_ctime,
-                            modified=stat.st_mtime,
-                            accessed=stat.st_atime
-                        )
-                        
-                        # Detailed analysis based on mode
-                        if self.current_config['hash_files']:
-                            file_stat.hash_md5 = self._calculate_file_hash(file_path, 'md5')
-                            file_stat.hash_sha256 = self._calculate_file_hash(file_path, 'sha256')
-                        
-                        if self.current_config['count_lines'] and file_type == FileType.TEXT:
-                            self._count_file_content(file_path, file_stat)
-                        
-                        # Get MIME type
-                        mime_type, _ = mimetypes.guess_type(str(file_path))
-                        file_stat.mime_type = mime_type or "application/octet-stream"
-                        
-                        self.files_data.append(file_stat)
-                        
-                        # Update counters
-                        file_count += 1
-                        total_size += size
-                        file_sizes.append(size)
-                        file_times.append(stat.st_mtime)
-                        
-                        # Update type and extension counts
-                        self.stats.file_types[file_type.value] += 1
-                        if extension:
-                            self.stats.extensions[extension] += 1
-                        
-                        # Progress reporting
-                        if file_count % 1000 == 0:
-                            print(f"  Processed {file_count} files...")
-                    
-                    except (OSError, PermissionError) as e:
-                        self.errors.append((str(file_path), str(e)))
-                        continue
+                # Report progress on a wall-clock schedule, not a file count
+                now = time.monotonic()
+                if now - last_progress >= self.PROGRESS_INTERVAL:
+                    print(f"  Processed {len(self.table) + len(batch)} files...")
+                    last_progress = now
             
         except KeyboardInterrupt:
             print("\nAnalysis interrupted by user")
@@ -341,80 +570,474 @@ class FileSystemAnalyzer:
             print(f"Error during analysis: {e}")
             self.errors.append((str(self.root_path), str(e)))
         
+        self._process_batch(batch)
+        
         # Store basic stats
-        self.stats.total_files = file_count
-        self.stats.total_dirs = dir_count
-        self.stats.total_size = total_size
+        sizes = self.table.column('sizes')
+        self.stats.total_files = len(self.table)
+        self.stats.total_size = int(sizes.sum()) if NUMPY_AVAILABLE else sum(sizes)
+        
+        # Type and extension counts in one pass over the table
+        self._count_file_types()
+    
+    def _process_batch(self, batch: List[FileRec]):
+        """Categorize a batch of file records and add them to the results"""
+        extensions, type_ids = self._categorize_batch([rec.name for rec in batch])
+        count_lines = self.current_config['count_lines']
+        mime_map = self._get_mime_map() if self.current_config['mime_types'] else None
+        
+        self.table.extend(batch, extensions, type_ids)
+        if not self.current_config['file_records']:
+            return
+        
+        for rec, extension, type_id in zip(batch, extensions, type_ids):
+            file_type = FILE_TYPES[type_id]
+            
+            # Basic file stats
+            file_stat = FileStats(
+                path=rec.path,
+                name=rec.name,
+                size=rec.size,
+                file_type=file_type,
+                extension=extension,
+                created=rec.ctime,
+                modified=rec.mtime,
+                accessed=rec.atime,
+                uid=rec.uid
+            )
+            
+            # Detailed analysis based on mode
+            if count_lines and file_type == FileType.TEXT:
+                self._count_file_content(rec.path, file_stat)
+            
+            # Get MIME type
+            if mime_map is not None:
+                file_stat.mime_type = mime_map.get(extension, "application/octet-stream")
+            
+            # Remember paths that share an inode so it is hashed only once
+            if rec.nlink > 1:
+                self._inode_to_paths[(rec.dev, rec.ino)].append(len(self.files_data))
+            
+            self.files_data.append(file_stat)
+    
+    def _count_file_types(self):
+        """Aggregate file type counts and sizes, and extension counts, from the file table"""
+        type_ids = self.table.column('type_ids')
+        ext_ids = self.table.column('ext_ids')
+        sizes = self.table.column('sizes')
+        ext_names = self.table.ext_names
+        if NUMPY_AVAILABLE:
+            np = _numpy()
+            type_counts = np.bincount(type_ids, minlength=len(FILE_TYPES)).tolist()
+            type_sizes = np.bincount(type_ids, weights=sizes, minlength=len(FILE_TYPES)).tolist()
+            ext_counts = np.bincount(ext_ids, minlength=len(ext_names)).tolist()
+        else:
+            counter = Counter(type_ids)
+            type_counts = [counter[i] for i in range(len(FILE_TYPES))]
+            type_sizes = [0] * len(FILE_TYPES)
+            for type_id, size in zip(type_ids, sizes):
+                type_sizes[type_id] += size
+            counter = Counter(ext_ids)
+            ext_counts = [counter[i] for i in range(len(ext_names))]
+        
+        for file_type, count, total_size in zip(FILE_TYPES, type_counts, type_sizes):
+            if count:
+                self.stats.file_types[file_type.value] += count
+                self.stats.file_type_sizes[file_type.value] += int(total_size)
         
-        # Store for later calculations
-        self._file_sizes = file_sizes
-        self._file_times = file_times
+        for extension, count in zip(ext_names, ext_counts):
+            if extension:  # Skip files without an extension
+                self.stats.extensions[extension] += count
+    
+    def _hash_files(self, files: List[FileStats], integrity: bool = False):
+        """Hash files on a thread pool (hashlib releases the GIL while digesting)"""
+        files = self._apply_cached_hashes(files, integrity)
+        if not files:
+            return
+        
+        print(f"Hashing {len(files):,} files...")
+        
+        # Fast fingerprint for duplicate detection, cryptographic hashes on request
+        algorithms = ('fast', 'md5', 'sha256') if integrity else ('fast',)
+        
+        def hash_file(file_stat: FileStats) -> Tuple[str, ...]:
+            return self._calculate_file_hashes(file_stat.path, algorithms, file_stat.uid)
+        
+        # Small files share a task so pool overhead doesn't dominate;
+        # large files get a task each to keep the workers evenly loaded
+        large = [f for f in files if f.size >= self.MMAP_THRESHOLD]
+        small = [f for f in files if f.size < self.MMAP_THRESHOLD]
+        
+        for group, chunksize in ((large, 1), (small, self.FILES_PER_TASK)):
+            results = self._map_parallel(hash_file, group, chunksize)
+            for file_stat, hashes in zip(group, results):
+                file_stat.fast_hash = hashes[0]
+                if integrity:
+                    file_stat.hash_md5, file_stat.hash_sha256 = hashes[1:]
+        
+        self._store_cached_hashes(files)
+    
+    def _open_hash_cache(self):
+        """Open the persistent hash cache, creating it if needed"""
+        import sqlite3  # Only runs with a hash cache need it
+        
+        try:
+            self._hash_cache = sqlite3.connect(self.hash_cache_path)
+            self._hash_cache.execute(
+                "CREATE TABLE IF NOT EXISTS hashes ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime REAL, "
+                "fast_algorithm TEXT, fast TEXT, md5 TEXT, sha256 TEXT)")
+        except sqlite3.Error as e:
+            self._disable_hash_cache(e)
+    
+    def _disable_hash_cache(self, error: Exception):
+        """Record a cache failure and carry on without the cache"""
+        print(f"Warning: hash cache disabled ({error})")
+        self.errors.append((self.hash_cache_path, str(error)))
+        if self._hash_cache is not None:
+            self._hash_cache.close()  # Rolls back this run's pending inserts
+        self._hash_cache = None
+    
+    def _close_hash_cache(self):
+        """Commit any pending cache writes and close the cache"""
+        import sqlite3
+        
+        try:
+            self._hash_cache.commit()
+        except sqlite3.Error as e:
+            self.errors.append((self.hash_cache_path, str(e)))
+        self._hash_cache.close()
+        self._hash_cache = None
+    
+    def _apply_cached_hashes(self, files: List[FileStats], integrity: bool = False) -> List[FileStats]:
+        """Fill hashes of unchanged files from the cache; return the files still to hash"""
+        if self._hash_cache is None:
+            return files
+        
+        import sqlite3
+        
+        pending = []
+        for i, file_stat in enumerate(files):
+            try:
+                row = self._hash_cache.execute(
+                    "SELECT size, mtime, fast_algorithm, fast, md5, sha256 FROM hashes WHERE path = ?",
+                    (file_stat.path,)).fetchone()
+            except sqlite3.Error as e:
+                self._disable_hash_cache(e)
+                return pending + files[i:]
+            
+            if row and row[:3] == (file_stat.size, file_stat.modified, FAST_HASH_NAME) \
+                    and row[3] and (row[4] or not integrity):
+                file_stat.fast_hash = row[3]
+                if integrity:
+                    file_stat.hash_md5, file_stat.hash_sha256 = row[4], row[5]
+            else:
+                pending.append(file_stat)
+        
+        return pending
+    
+    def _store_cached_hashes(self, files: List[FileStats]):
+        """Record freshly computed hashes in the cache"""
+        if self._hash_cache is None:
+            return
+        
+        import sqlite3
+        
+        try:
+            self._hash_cache.executemany(
+                "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(f.path, f.size, f.modified, FAST_HASH_NAME, f.fast_hash, f.hash_md5, f.hash_sha256)
+                 for f in files if f.fast_hash])
+            # Commit per batch so overlapping runs don't wait on a run-long write lock
+            self._hash_cache.commit()
+        except sqlite3.Error as e:
+            self._disable_hash_cache(e)
+    
+    def _map_parallel(self, func, items: List, chunksize: int = 1) -> Generator:
+        """Map func over items on the hash thread pool, yielding results in order"""
+        if not items:
+            return
+        
+        def run_chunk(chunk: List) -> List:
+            return [func(item) for item in chunk]
+        
+        chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+        
+        with ThreadPoolExecutor(max_workers=self.HASH_WORKERS) as executor:
+            # Submit in batches to bound the number of in-flight jobs
+            for start in range(0, len(chunks), self.HASH_BATCH_SIZE):
+                for results in executor.map(run_chunk, chunks[start:start + self.HASH_BATCH_SIZE]):
+                    yield from results
+    
+    def _walk(self, root: str, max_files: Optional[int] = None,
+              max_seconds: Optional[float] = None) -> Generator[FileRec, None, None]:
+        """Yield a FileRec for every regular file under root, depth-first, up to the sample limits"""
+        max_depth = self.current_config['max_depth']
+        deadline = None if max_seconds is None else time.monotonic() + max_seconds
+        remaining = max_files
+        
+        # Explicit stack of (directory, depth)
+        pending = deque([(root, 0)])
+        while pending:
+            if deadline is not None and time.monotonic() >= deadline:
+                self.sampled = True
+                return
+            
+            dir_path, depth = pending.pop()
+            files, subdirs = self._scan_directory(dir_path)
+            
+            self.stats.total_dirs += len(subdirs)
+            if max_depth is None or depth < max_depth:
+                pending.extend((path, depth + 1) for path in reversed(self._dirs_to_enter(subdirs)))
+            
+            if remaining is not None:
+                if len(files) >= remaining:
+                    yield from files[:remaining]
+                    self.sampled = len(files) > remaining or bool(pending)
+                    return
+                remaining -= len(files)
+            
+            yield from files
+    
+    def _parallel_walk(self, root: str,
+                       workers: Optional[int] = None) -> Generator[FileRec, None, None]:
+        """Yield the same records as _walk, in the same order, reading directories on a thread pool"""
+        workers = workers or self.WALK_WORKERS
+        max_depth = self.current_config['max_depth']
+        
+        # The stack is consumed in _walk's order; scans are started ahead of
+        # time for the directories nearest its top. Every queued directory is
+        # scanned eventually, so no read-ahead is wasted, and the number in
+        # flight is capped so the queue of paths stays on our side.
+        pending = deque([(root, 0)])
+        inflight = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while pending:
+                for dir_path, _ in islice(reversed(pending), workers * 2):
+                    if len(inflight) >= workers * 2:
+                        break
+                    if dir_path not in inflight:
+                        inflight[dir_path] = executor.submit(self._scan_directory, dir_path)
+                
+                dir_path, depth = pending.pop()
+                files, subdirs = inflight.pop(dir_path).result()
+                
+                self.stats.total_dirs += len(subdirs)
+                if max_depth is None or depth < max_depth:
+                    pending.extend((path, depth + 1)
+                                   for path in reversed(self._dirs_to_enter(subdirs)))
+                
+                yield from files
+    
+    def _dirs_to_enter(self, subdirs: List[Tuple[str, int, int]]) -> List[str]:
+        """Filter scanned subdirectories to those on the root device (unless crossing) not yet visited"""
+        check_device = not self.cross_device and bool(self._root_dev)
+        paths = []
+        for path, dev, ino in subdirs:
+            # A zero st_dev or st_ino means the platform did not report it, not a match
+            if check_device and dev and dev != self._root_dev:
+                self.skipped_mounts.append(path)
+                continue  # Mount point: /proc, network shares, other disks
+            if ino:
+                if (dev, ino) in self._visited_inodes:
+                    continue  # Bind mount or directory hard link loop
+                self._visited_inodes.add((dev, ino))
+            paths.append(path)
+        return paths
+    
+    def _scan_directory(self, dir_path: str) -> Tuple[List[FileRec], List[Tuple[str, int, int]]]:
+        """Read one directory into file records and (path, st_dev, st_ino) subdirectory entries"""
+        skip_hidden = self.current_config['skip_hidden']
+        skip_system = self.current_config['skip_system']
+        filter_dirs = skip_hidden or skip_system
+        cache_path = self.hash_cache_path
+        fast_stat = self._fast_stat
+        files = []
+        subdirs = []
+        
+        # DirEntry type checks are answered from the readdir buffer; metadata
+        # comes from lstat, or statx(AT_STATX_DONT_SYNC) when use_statx is set.
+        # The ctypes statx call costs about three lstats on a local disk, so
+        # it only pays off where a plain stat revalidates with a server.
+        # entry.path is the directory prefix plus name, joined in C by scandir,
+        # so no per-file os.path.join is needed.
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    path = entry.path
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not (filter_dirs and self._is_hidden_or_system(path)):
+                                stat = fast_stat(path) if fast_stat else entry.stat(follow_symlinks=False)
+                                if not stat.st_ino:
+                                    # Windows DirEntry.stat() leaves st_dev/st_ino at 0
+                                    stat = os.stat(path, follow_symlinks=False)
+                                subdirs.append((path, stat.st_dev, stat.st_ino))
+                            continue
+                        
+                        if not entry.is_file(follow_symlinks=False):
+                            continue  # Symlinks, sockets, devices
+                        
+                        # Skip hidden/system files and our own hash cache
+                        name = entry.name
+                        if (skip_hidden and name.startswith('.')) or \
+                           (skip_system and self._is_system_file(name)) or \
+                           path == cache_path:
+                            continue
+                        
+                        stat = fast_stat(path) if fast_stat else entry.stat(follow_symlinks=False)
+                        files.append(FileRec(name, path, stat.st_size, stat.st_mtime,
+                                             stat.st_ctime, stat.st_atime,
+                                             stat.st_dev, stat.st_ino, stat.st_nlink, stat.st_uid))
+                    except OSError as e:
+                        self.errors.append((path, str(e)))
+        except OSError as e:
+            self.errors.append((dir_path, str(e)))
+            return [], []
+        
+        return files, subdirs
     
     def _calculate_statistics(self):
         """Calculate derived statistics"""
-        if not self.files_data:
+        table = self.table
+        if not len(table):
             return
         
-        # Size statistics
-        if self._file_sizes:
-            self.stats.avg_file_size = statistics.mean(self._file_sizes)
-            self.stats.median_file_size = statistics.median(self._file_sizes)
+        sizes = table.column('sizes')
+        mtimes = table.column('mtimes')
+        
+        # Size statistics, then largest, smallest (non-empty), oldest and newest by index
+        if NUMPY_AVAILABLE:
+            np = _numpy()
+            self.stats.avg_file_size = float(sizes.mean())
+            self.stats.median_file_size = float(np.median(sizes))
             
-            # Find largest and smallest files
-            largest = max(self.files_data, key=lambda x: x.size, default=None)
-            smallest = min((f for f in self.files_data if f.size > 0), 
-                          key=lambda x: x.size, default=None)
+            largest = int(sizes.argmax())
+            non_empty = np.flatnonzero(sizes > 0)
+            smallest = int(non_empty[sizes[non_empty].argmin()]) if non_empty.size else None
+            oldest = int(mtimes.argmin())
+            newest = int(mtimes.argmax())
+        else:
+            self.stats.avg_file_size = statistics.mean(sizes)
+            self.stats.median_file_size = statistics.median(sizes)
             
-            if largest:
-                self.stats.largest_file = (largest.path, largest.size)
-            if smallest:
-                self.stats.smallest_file = (smallest.path, smallest.size)
+            indices = range(len(table))
+            largest = max(indices, key=sizes.__getitem__)
+            smallest = min((i for i in indices if sizes[i] > 0),
+                           key=sizes.__getitem__, default=None)
+            oldest = min(indices, key=mtimes.__getitem__)
+            newest = max(indices, key=mtimes.__getitem__)
+        
+        self.stats.largest_file = (table.paths[largest], int(sizes[largest]))
+        if smallest is not None:
+            self.stats.smallest_file = (table.paths[smallest], int(sizes[smallest]))
         
         # Time statistics
-        if self._file_times:
-            oldest = min(self.files_data, key=lambda x: x.modified, default=None)
-            newest = max(self.files_data, key=lambda x: x.modified, default=None)
-            
-            if oldest:
-                self.stats.oldest_file = (oldest.path, oldest.modified)
-            if newest:
-                self.stats.newest_file = (newest.path, newest.modified)
+        self.stats.oldest_file = (table.paths[oldest], float(mtimes[oldest]))
+        self.stats.newest_file = (table.paths[newest], float(mtimes[newest]))
     
     def _find_duplicates(self):
-        """Find duplicate files by hash and size"""
+        """Find duplicate files by size, prefix fingerprint and full fingerprint"""
         print("Looking for duplicate files...")
         
-        # Group files by size first (quick check)
+        # Hard links share one inode, so only the first scanned path of each is read
+        link_groups = self._hardlink_groups()
+        linked = {id(f) for group in link_groups for f in group[1:]}
+        
+        # Stage 1: only sizes shared by several inodes can hold duplicates
         size_groups = defaultdict(list)
         for file_stat in self.files_data:
-            if file_stat.size > 0:  # Skip empty files
+            if file_stat.size > 0 and id(file_stat) not in linked:  # Skip empty files
                 size_groups[file_stat.size].append(file_stat)
         
-        # Check groups with multiple files
-        duplicate_candidates = []
-        for size, files in size_groups.items():
-            if len(files) > 1:
-                duplicate_candidates.extend(files)
+        candidate_sizes = {size for size, files in size_groups.items() if len(files) > 1}
+        duplicate_candidates = [f for size in candidate_sizes for f in size_groups[size]]
         
-        # Now group by hash for candidates
+        # Stage 2: fingerprint the first block of each candidate not already known
+        unhashed = self._apply_cached_hashes([f for f in duplicate_candidates if not f.fast_hash])
+        prefix_groups = self._group_by_prefix(unhashed)
+        
+        # Stage 3: full fingerprints only for files whose prefix still collides
+        # between inodes, or that may match a file whose fingerprint came from the cache
+        known_sizes = {f.size for f in duplicate_candidates if f.fast_hash}
+        to_hash = []
+        for (size, _), files in prefix_groups.items():
+            if size in known_sizes or len(files) > 1:
+                to_hash.extend(files)
+        self._hash_files(to_hash)
+        self._copy_hashes_to_links(link_groups)
+        
+        # Now group every candidate path, hard links included, by size and fingerprint,
+        # counting each inode once since deleting a hard link frees nothing
+        link_of = {id(f): id(group[0]) for group in link_groups for f in group}
         hash_groups = defaultdict(list)
-        for file_stat in duplicate_candidates:
-            if file_stat.hash_md5:  # Only if we calculated hash
-                hash_groups[file_stat.hash_md5].append(file_stat.path)
-        
-        # Create duplicate records
-        for hash_value, file_paths in hash_groups.items():
-            if len(file_paths) > 1:
-                size = next((f.size for f in self.files_data 
-                           if f.path == file_paths[0]), 0)
+        hash_inodes = defaultdict(set)
+        for file_stat in self.files_data:
+            if file_stat.fast_hash and file_stat.size in candidate_sizes:
+                key = (file_stat.size, file_stat.fast_hash)
+                hash_groups[key].append(file_stat.path)
+                hash_inodes[key].add(link_of.get(id(file_stat), id(file_stat)))
+        
+        # Create duplicate records; an inode whose only "copies" are its own links is none
+        for (size, hash_value), file_paths in hash_groups.items():
+            copies = len(hash_inodes[(size, hash_value)])
+            if copies > 1:
                 self.duplicates.append(DuplicateFile(
                     hash_value=hash_value,
                     size=size,
-                    files=file_paths
+                    files=file_paths,
+                    copies=copies
                 ))
+                self._dup_sizes.append(size)
+                self._dup_counts.append(copies)
         
         print(f"Found {len(self.duplicates)} groups of duplicate files")
     
+    def _hardlink_groups(self) -> List[List[FileStats]]:
+        """Group the scanned paths of each inode with several links; the first path represents it"""
+        files = self.files_data
+        return [[files[i] for i in indices]
+                for indices in self._inode_to_paths.values() if len(indices) > 1]
+    
+    @staticmethod
+    def _copy_hashes_to_links(link_groups: List[List[FileStats]]):
+        """Give every hard link the hashes computed for its inode's representative path"""
+        for first, *others in link_groups:
+            for file_stat in others:
+                file_stat.fast_hash = first.fast_hash
+                file_stat.hash_md5 = first.hash_md5
+                file_stat.hash_sha256 = first.hash_sha256
+    
+    def _duplicate_wasted_space(self) -> int:
+        """Bytes freed by keeping only one copy of every duplicate group"""
+        if NUMPY_AVAILABLE:
+            np = _numpy()
+            sizes = np.frombuffer(self._dup_sizes, dtype=np.int64)
+            counts = np.frombuffer(self._dup_counts, dtype=np.int64)
+            return int(np.dot(sizes, counts - 1))
+        return sum(size * (count - 1) for size, count in zip(self._dup_sizes, self._dup_counts))
+    
+    def _group_by_prefix(self, files: List[FileStats]) -> Dict[Tuple[int, str], List[FileStats]]:
+        """Group files by size and prefix fingerprint; files no larger than the prefix are finished"""
+        def prefix_hash(file_stat: FileStats) -> str:
+            return self._calculate_prefix_hash(file_stat.path, file_stat.uid)
+        
+        prefixes = self._map_parallel(prefix_hash, files, self.FILES_PER_TASK)
+        
+        prefix_groups = defaultdict(list)
+        fully_hashed = []
+        for file_stat, prefix in zip(files, prefixes):
+            if not prefix:
+                continue
+            if file_stat.size <= self.PREFIX_SIZE:
+                file_stat.fast_hash = prefix  # Prefix covers the whole file
+                fully_hashed.append(file_stat)
+            else:
+                prefix_groups[(file_stat.size, prefix)].append(file_stat)
+        
+        self._store_cached_hashes(fully_hashed)
+        return prefix_groups
+    
     def _generate_reports(self):
         """Generate various analysis reports"""
         print("\n" + "=" * 60)
@@ -449,129 +1072,295 @@ class FileSystemAnalyzer:
         
         if self.stats.largest_file[0]:
             size_str = self._format_size(self.stats.largest_file[1])
-            print(f"  Largest File:      {size_str} ({Path(self.stats.largest_file[0]).name})")
+            print(f"  Largest File:      {size_str} ({os.path.basename(self.stats.largest_file[0])})")
         
         if self.stats.oldest_file[0]:
             date_str = datetime.fromtimestamp(self.stats.oldest_file[1]).strftime('%Y-%m-%d')
-            print(f"  Oldest File:       {date_str} ({Path(self.stats.oldest_file[0]).name})")
+            print(f"  Oldest File:       {date_str} ({os.path.basename(self.stats.oldest_file[0])})")
     
     def _print_file_type_distribution(self):
         """Print file type distribution"""
-        print("\n📁 FILE TYPE DISTRIBUTION")
+        lines = ["\n📁 FILE TYPE DISTRIBUTION"]
         
         total_files = self.stats.total_files
         if total_files == 0:
-            print("  No files found")
+            lines.append("  No files found")
+            self._write_lines(lines)
             return
         
         # Sort by count descending
         sorted_types = sorted(self.stats.file_types.items(), 
                             key=lambda x: x[1], reverse=True)
         
+        type_sizes = self.stats.file_type_sizes
         for file_type, count in sorted_types:
             percentage = (count / total_files) * 100
             bar_length = int(percentage / 2)  # Scale for display
             bar = "█" * bar_length + "░" * (50 - bar_length)
-            print(f"  {file_type:15} {bar} {count:6,} ({percentage:5.1f}%)")
+            size_str = self._format_size(type_sizes.get(file_type, 0))
+            lines.append(f"  {file_type:15} {bar} {count:6,} ({percentage:5.1f}%) {size_str:>10}")
+        
+        self._write_lines(lines)
     
     def _print_largest_files(self, limit: int = 10):
         """Print largest files"""
-        print(f"\n🏆 TOP {limit} LARGEST FILES")
+        lines = [f"\n🏆 TOP {limit} LARGEST FILES"]
         
-        # Sort files by size descending
-        sorted_files = sorted(self.files_data, 
-                            key=lambda x: x.size, reverse=True)[:limit]
+        # Select the top entries without sorting the whole table
+        table = self.table
+        sizes = table.column('sizes')
+        count = min(limit, len(table))
+        root = str(self.root_path)
         
-        for i, file_stat in enumerate(sorted_files, 1):
-            size_str = self._format_size(file_stat.size)
-            relative_path = Path(file_stat.path).relative_to(self.root_path)
-            print(f"  {i:2}. {size_str:>10}  {relative_path}")
+        if NUMPY_AVAILABLE and count:
+            np = _numpy()
+            top = np.argpartition(sizes, -count)[-count:]
+            top = top[np.lexsort((top, -sizes[top]))]  # Size descending, then scan order
+        else:
+            top = heapq.nlargest(count, range(len(table)), key=sizes.__getitem__)
+        
+        for i, index in enumerate(top, 1):
+            size_str = self._format_size(int(sizes[index]))
+            relative_path = os.path.relpath(table.paths[index], root)
+            lines.append(f"  {i:2}. {size_str:>10}  {relative_path}")
+        
+        self._write_lines(lines)
     
     def _print_duplicates_report(self):
         """Print duplicates report"""
-        print(f"\n🔄 DUPLICATE FILES ({len(self.duplicates)} groups)")
+        lines = [f"\n🔄 DUPLICATE FILES ({len(self.duplicates)} groups)"]
         
         # Sort by size descending (largest duplicates first)
-        sorted_dups = sorted(self.duplicates, 
-                           key=lambda x: x.size * x.count, reverse=True)[:10]
+        sorted_dups = heapq.nlargest(10, self.duplicates,
+                                     key=lambda x: x.size * x.copies)
+        root = str(self.root_path)
         
         for i, dup in enumerate(sorted_dups, 1):
             size_str = self._format_size(dup.size)
-            space_wasted = dup.size * (dup.count - 1)
+            space_wasted = dup.size * (dup.copies - 1)
             space_str = self._format_size(space_wasted)
-            print(f"\n  Group {i}: {size_str} each ({dup.count} copies)")
-            print(f"  Waste: {space_str} (if keeping only one copy)")
+            links = f", {dup.count} paths" if dup.count != dup.copies else ""
+            copies = "1 copy" if dup.copies == 1 else f"{dup.copies} copies"
+            lines.append(f"\n  Group {i}: {size_str} each ({copies}{links})")
+            lines.append(f"  Waste: {space_str} (if keeping only one copy)")
             
             for j, file_path in enumerate(dup.files[:3], 1):  # Show first 3
-                relative_path = Path(file_path).relative_to(self.root_path)
-                print(f"    {j}. {relative_path}")
+                relative_path = os.path.relpath(file_path, root)
+                lines.append(f"    {j}. {relative_path}")
             
             if len(dup.files) > 3:
-                print(f"    ... and {len(dup.files) - 3} more")
+                lines.append(f"    ... and {len(dup.files) - 3} more")
+        
+        self._write_lines(lines)
     
     def _print_error_report(self):
         """Print error report"""
-        print(f"\n❌ ERRORS ENCOUNTERED ({len(self.errors)} errors)")
+        lines = [f"\n❌ ERRORS ENCOUNTERED ({len(self.errors)} errors)"]
         
         for i, (path, error) in enumerate(self.errors[:10], 1):
-            print(f"  {i}. {error}: {path}")
+            lines.append(f"  {i}. {error}: {path}")
         
         if len(self.errors) > 10:
-            print(f"  ... and {len(self.errors) - 10} more errors")
+            lines.append(f"  ... and {len(self.errors) - 10} more errors")
+        
+        self._write_lines(lines)
+    
+    @staticmethod
+    def _write_lines(lines: List[str]):
+        """Write report lines with a single stdout call"""
+        sys.stdout.write('\n'.join(lines) + '\n')
     
     # ==================== Utility Methods ====================
     
-    def _categorize_file(self, extension: str, file_path: Path) -> FileType:
-        """Categorize file by extension"""
-        if extension in self.TEXT_EXTENSIONS:
-            return FileType.TEXT
-        elif extension in self.IMAGE_EXTENSIONS:
-            return FileType.IMAGE
-        elif extension in self.VIDEO_EXTENSIONS:
-            return FileType.VIDEO
-        elif extension in self.AUDIO_EXTENSIONS:
-            return FileType.AUDIO
-        elif extension in self.ARCHIVE_EXTENSIONS:
-            return FileType.ARCHIVE
-        elif extension in self.DOCUMENT_EXTENSIONS:
-            return FileType.DOCUMENT
-        elif extension in self.CODE_EXTENSIONS:
-            return FileType.CODE
-        elif extension in self.EXECUTABLE_EXTENSIONS:
-            return FileType.EXECUTABLE
-        elif extension in self.SYSTEM_EXTENSIONS:
-            return FileType.SYSTEM
-        else:
-            return FileType.OTHER
+    def _categorize_batch(self, names: List[str]) -> Tuple[List[str], List[int]]:
+        """Derive extensions and file type ids (indexes into FILE_TYPES) for a batch of file names"""
+        extensions = []
+        for name in names:
+            base, _, suffix = name.rpartition('.')
+            extensions.append('.' + suffix.lower() if base and suffix else '')
+        
+        # One C-level pass over the extension map for the whole batch
+        type_ids = list(map(self._EXT_TYPE_IDS.get, extensions, repeat(FILE_TYPE_IDS[FileType.OTHER])))
+        return extensions, type_ids
     
-    def _calculate_file_hash(self, file_path: Path, algorithm: str = 'md5') -> str:
-        """Calculate file hash"""
-        hash_func = hashlib.new(algorithm)
+    @classmethod
+    def _get_mime_map(cls) -> Dict[str, str]:
+        """Extension -> MIME type table matching mimetypes.guess_type() for a bare suffix"""
+        if cls._MIME_MAP is None:
+            if not mimetypes.inited:
+                mimetypes.init()
+            
+            # Extensions are looked up lowercased; guess_type() also retries in lowercase
+            mime_map = {}
+            for suffix, mime_type in mimetypes.types_map.items():
+                mime_map.setdefault(suffix.lower(), mime_type)
+            # Encoding suffixes ('.gz') have no type of their own; shorthands
+            # for compressed archives ('.tgz' -> '.tar.gz') report the inner type
+            for suffix in mimetypes.encodings_map:
+                mime_map.pop(suffix, None)
+            for suffix, expanded in mimetypes.suffix_map.items():
+                inner = mimetypes.types_map.get(os.path.splitext(expanded)[0])
+                if inner:
+                    mime_map[suffix] = inner
+            cls._MIME_MAP = mime_map
         
+        return cls._MIME_MAP
+    
+    def _calculate_file_hashes(self, file_path: Path,
+                               algorithms: Tuple[str, ...] = ('md5', 'sha256'),
+                               uid: int = -1) -> Tuple[str, ...]:
+        """Calculate several file hashes in a single pass over the file"""
         try:
-            with open(file_path, 'rb') as f:
-                # Read in chunks for large files
-                for chunk in iter(lambda: f.read(8192), b''):
-                    hash_func.update(chunk)
+            with open(self._open_for_read(file_path, uid), 'rb', buffering=0) as f:
+                size = os.fstat(f.fileno()).st_size
+                hash_funcs = [self._new_hasher(algorithm, size) for algorithm in algorithms]
+                
+                # Large files: hash straight from the page cache, no chunk copies
+                if size >= self.MMAP_THRESHOLD:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                            mm.madvise(mmap.MADV_SEQUENTIAL)
+                        for hash_func in hash_funcs:
+                            hash_func.update(mm)
+                
+                # Single small-file hash: let hashlib drive the reads (Python 3.11+)
+                elif len(hash_funcs) == 1 and hasattr(hashlib, 'file_digest'):
+                    hashlib.file_digest(f, lambda: hash_funcs[0])
+                
+                else:
+                    for chunk in iter(lambda: f.read(self.HASH_CHUNK_SIZE), b''):
+                        for hash_func in hash_funcs:
+                            hash_func.update(chunk)
+            
+            return tuple(hash_func.hexdigest() for hash_func in hash_funcs)
+        except (IOError, OSError, ValueError):
+            return ("",) * len(algorithms)
+    
+    def _calculate_prefix_hash(self, file_path: str, uid: int = -1) -> str:
+        """Calculate the fast fingerprint of the first PREFIX_SIZE bytes"""
+        hash_func = self._new_hasher('fast')
+        
+        # Raw descriptor and a single read; no file object or buffer in between
+        try:
+            fd = self._open_for_read(file_path, uid)
+            try:
+                hash_func.update(os.read(fd, self.PREFIX_SIZE))
+            finally:
+                os.close(fd)
             return hash_func.hexdigest()
         except (IOError, OSError):
             return ""
     
-    def _count_file_content(self, file_path: Path, file_stat: FileStats):
+    @staticmethod
+    def _open_for_read(file_path: str, uid: int = -1) -> int:
+        """Open a file descriptor for reading without updating the access time where allowed"""
+        flags = os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0)
+        # Other users' files would refuse O_NOATIME, so open them plainly in one call
+        noatime = getattr(os, 'O_NOATIME', 0) if EUID in (0, uid) else 0
+        if noatime:
+            try:
+                return os.open(file_path, flags | noatime)
+            except PermissionError as e:
+                if e.errno != errno.EPERM:  # e.g. root without CAP_FOWNER over this file
+                    raise
+        return os.open(file_path, flags)
+    
+    @classmethod
+    def _new_hasher(cls, algorithm: str, size: int = 0):
+        """Create a hash object; 'fast' is a fingerprint chosen by file size"""
+        if algorithm == 'fast':
+            # Files of one size always get the same algorithm, so keys stay comparable
+            if BLAKE3_AVAILABLE and size >= cls.BLAKE3_THRESHOLD:
+                return Blake3Hash()
+            if XXHASH_AVAILABLE:
+                return xxhash.xxh3_64()
+            return hashlib.blake2b(digest_size=8)
+        if algorithm in CRYPTOGRAPHY_HASHES:
+            return CryptographyHash(algorithm)
+        return hashlib.new(algorithm)
+    
+    @staticmethod
+    def _hash_backend() -> str:
+        """Describe the library that computes MD5/SHA-256"""
+        if OPENSSL_HASHLIB:
+            import ssl
+            return f"hashlib ({ssl.OPENSSL_VERSION})"
+        if CRYPTOGRAPHY_HASHES:
+            return "cryptography (OpenSSL)"
+        return "hashlib (built-in implementation)"
+    
+    def _count_file_content(self, file_path: str, file_stat: FileStats):
         """Count lines, words, and characters in text file"""
+        lines = words = chars = 0
+        prev_byte = 0x0a
+        
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                file_stat.line_count = content.count('\n')
-                file_stat.word_count = len(content.split())
-                file_stat.char_count = len(content)
-        except (UnicodeDecodeError, IOError, OSError):
-            # Not a text file or can't read
-            pass
-    
-    def _is_hidden_or_system(self, path: Path) -> bool:
+            with open(file_path, 'rb') as f:
+                if not file_stat.size:
+                    return
+                
+                # Stream fixed-size windows of the mapping; memory use stays bounded
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    size = len(mm)
+                    if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    with memoryview(mm) as view:
+                        for start in range(0, size, self.COUNT_CHUNK_SIZE):
+                            chunk_lines, chunk_words, chunk_chars, prev_byte = \
+                                self._count_text_bytes(view[start:start + self.COUNT_CHUNK_SIZE],
+                                                       prev_byte)
+                            lines += chunk_lines
+                            words += chunk_words
+                            chars += chunk_chars
+        except (IOError, OSError, ValueError):
+            # Can't read
+            return
+        
+        file_stat.line_count = lines
+        file_stat.word_count = words
+        file_stat.char_count = chars
+    
+    def _count_text_bytes(self, data, prev_byte: int = 0x0a) -> Tuple[int, int, int, int]:
+        """
+        Count lines, words and UTF-8 characters in a block of bytes
+        
+        Counts match reading the file in text mode: words are runs of non-whitespace
+        and CRLF or a lone CR is one line break. prev_byte is the last byte of the
+        previous block (the last element of the result) so a file can be fed in blocks.
+        """
+        if not len(data):
+            return 0, 0, 0, prev_byte
+        
+        if NUMPY_AVAILABLE:
+            np = _numpy()
+            buf = np.frombuffer(data, dtype=np.uint8)
+            is_space = (buf == 0x20) | ((buf >= 0x09) & (buf <= 0x0d))
+            is_lf = buf == 0x0a
+            is_cr = buf == 0x0d
+            
+            # A word starts at a non-space byte that follows a space
+            words = int(np.count_nonzero(is_space[:-1] & ~is_space[1:]))
+            words += int(prev_byte in self.ASCII_WHITESPACE and not is_space[0])
+            
+            crlf = int(np.count_nonzero(is_cr[:-1] & is_lf[1:]))
+            crlf += int(prev_byte == 0x0d and bool(is_lf[0]))
+            lines = int(np.count_nonzero(is_lf)) + int(np.count_nonzero(is_cr)) - crlf
+            chars = buf.size - int(np.count_nonzero((buf & 0xc0) == 0x80)) - crlf
+            return lines, words, chars, int(buf[-1])
+        
+        data = bytes(data)
+        words = len(data.split())
+        if prev_byte not in self.ASCII_WHITESPACE and not data[:1].isspace():
+            words -= 1  # Word continues from the previous block
+        
+        crlf = data.count(b'\r\n') + (prev_byte == 0x0d and data[:1] == b'\n')
+        lines = data.count(b'\n') + data.count(b'\r') - crlf
+        chars = len(data.translate(None, self.UTF8_CONTINUATION_BYTES)) - crlf
+        return lines, words, chars, data[-1]
+    
+    def _is_hidden_or_system(self, path: str) -> bool:
         """Check if file/directory is hidden or system"""
-        if path.name.startswith('.'):
+        if os.path.basename(path).startswith('.'):
             return True
         
         try:
@@ -579,18 +1368,18 @@ class FileSystemAnalyzer:
                 import ctypes
                 FILE_ATTRIBUTE_HIDDEN = 0x2
                 FILE_ATTRIBUTE_SYSTEM = 0x4
-                attrs = ctypes.windll.kernel32.GetFileAttributesW(str(path))
+                attrs = ctypes.windll.kernel32.GetFileAttributesW(path)
                 return attrs != -1 and (attrs & (FILE_ATTRIBUTE_HIDDEN | FILE_ATTRIBUTE_SYSTEM))
             else:  # Unix/Linux/Mac
                 return False
         except:
             return False
     
-    def _is_system_file(self, path: Path) -> bool:
+    def _is_system_file(self, name: str) -> bool:
         """Check if file is a system file"""
         # Add your system file detection logic here
         system_patterns = ['thumbs.db', '.ds_store', 'desktop.ini']
-        return path.name.lower() in system_patterns
+        return name.lower() in system_patterns
     
     def _format_size(self, size_bytes: float) -> str:
         """Format file size in human-readable format"""
@@ -613,32 +1402,78 @@ class FileSystemAnalyzer:
                 'root_path': str(self.root_path),
                 'mode': self.mode.value,
                 'timestamp': datetime.now().isoformat(),
-                'duration_seconds': time.time() - getattr(self, '_start_time', 0)
+                'duration_seconds': time.time() - getattr(self, '_start_time', 0),
+                'sampled': self.sampled,
+                'skipped_mounts': self.skipped_mounts
             },
             'directory_stats': self.stats.to_dict(),
-            'file_count': len(self.files_data),
+            'file_count': len(self.table),
             'duplicate_groups': len(self.duplicates),
             'errors': len(self.errors)
         }
         
-        # Add file data (limited in detailed mode)
-        if self.mode in [AnalysisMode.DETAILED, AnalysisMode.DEEP]:
-            data['files'] = [f.to_dict() for f in self.files_data[:1000]]  # Limit
-            data['duplicates'] = [{
-                'hash': d.hash_value,
-                'size': d.size,
-                'count': d.count,
-                'files': d.files[:5]  # Limit
-            } for d in self.duplicates]
+        with open(output_path, 'wb') as f:
+            summary = self._json_dumps(data, indent=True)
+            
+            # Add file data (limited in detailed mode), streamed one record per line
+            if self.mode in [AnalysisMode.DETAILED, AnalysisMode.DEEP]:
+                f.write(summary[:-2])  # Reopen the top-level object
+                self._write_json_array(f, 'files',
+                                       (fs.to_dict() for fs in self.files_data[:1000]))  # Limit
+                self._write_json_array(f, 'duplicates', ({
+                    'hash': d.hash_value,
+                    'size': d.size,
+                    'count': d.count,
+                    'copies': d.copies,
+                    'files': d.files[:5]  # Limit
+                } for d in self.duplicates))
+                f.write(b'\n}')
+            else:
+                f.write(summary)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, default=str)
+        print(f"\n✅ Results exported to: {output_path} ({'orjson' if ORJSON_AVAILABLE else 'json'})")
+    
+    @classmethod
+    def _write_json_array(cls, f, key: str, records):
+        """Write ',\n  "key": [...]' to an open JSON object, one encoded record at a time"""
+        f.write(b',\n  ' + cls._json_dumps(key) + b': [')
+        separator = b'\n    '
+        for record in records:
+            f.write(separator)
+            f.write(cls._json_dumps(record))
+            separator = b',\n    '
+        f.write(b'\n  ]')
+    
+    @staticmethod
+    def _json_dumps(data, indent: bool = False) -> bytes:
+        """Encode data as UTF-8 JSON, with orjson when it is installed"""
+        if ORJSON_AVAILABLE:
+            option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            try:
+                return orjson.dumps(data, default=str, option=option)
+            except TypeError:
+                pass  # e.g. undecodable file names; the standard encoder escapes them
+        return json.dumps(data, indent=2 if indent else None, default=str).encode('utf-8')
+    
+    def _file_records(self) -> Iterable[FileStats]:
+        """Per-file records, rebuilt one at a time from the table when the mode kept none"""
+        if self.current_config['file_records']:
+            return self.files_data
         
-        print(f"\n✅ Results exported to: {output_path}")
+        table = self.table
+        ext_names = table.ext_names
+        return (FileStats(path=path, name=os.path.basename(path), size=size,
+                          file_type=FILE_TYPES[type_id], extension=ext_names[ext_id],
+                          created=ctime, modified=mtime, accessed=atime)
+                for path, size, type_id, ext_id, ctime, mtime, atime in zip(
+                    table.paths, table.sizes, table.type_ids, table.ext_ids,
+                    table.ctimes, table.mtimes, table.atimes))
     
     def export_to_csv(self, output_path: str):
         """Export file data to CSV"""
-        if not self.files_data:
+        if not len(self.table):
             print("No file data to export")
             return
         
@@ -646,17 +1481,21 @@ class FileSystemAnalyzer:
                      'created', 'modified', 'accessed', 'mime_type', 
                      'line_count', 'word_count', 'char_count']
         
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for file_stat in self.files_data:
-                row = file_stat.to_dict()
-                row['created'] = datetime.fromtimestamp(file_stat.created).isoformat()
-                row['modified'] = datetime.fromtimestamp(file_stat.modified).isoformat()
-                row['accessed'] = datetime.fromtimestamp(file_stat.accessed).isoformat()
-                row['file_type'] = file_stat.file_type.value
-                writer.writerow(row)
+        fromtimestamp = datetime.fromtimestamp
+        rows = ((fs.path, fs.name, fs.size, fs.file_type.value, fs.extension,
+                 fromtimestamp(fs.created).isoformat(),
+                 fromtimestamp(fs.modified).isoformat(),
+                 fromtimestamp(fs.accessed).isoformat(),
+                 fs.mime_type, fs.line_count, fs.word_count, fs.char_count)
+                for fs in self._file_records())
+        
+        # Rows are streamed from a generator into a 1 MiB write buffer;
+        # undecodable file names are written back as their original bytes
+        with open(output_path, 'w', newline='', encoding='utf-8', errors='surrogateescape',
+                  buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows(rows)
         
         print(f"\n✅ CSV exported to: {output_path}")
 
@@ -668,6 +1507,13 @@ def create_visualizations(analyzer: FileSystemAnalyzer, output_dir: str = "visua
         print("Visualization disabled: matplotlib not available")
         return
     
+    # Non-interactive backend; simplify and chunk long paths when rendering
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    plt.rcParams['path.simplify'] = True
+    plt.rcParams['agg.path.chunksize'] = 10000
+    
     os.makedirs(output_dir, exist_ok=True)
     
     # 1. File Type Distribution Pie Chart
@@ -708,14 +1554,16 @@ def create_visualizations(analyzer: FileSystemAnalyzer, output_dir: str = "visua
     plt.close()
     
     # 2. File Size Distribution Histogram
-    if analyzer.files_data:
+    if len(analyzer.table):
         fig2, ax2 = plt.subplots(figsize=(12, 6))
         
-        # Get file sizes in MB for better visualization
-        sizes_mb = [f.size / (1024 * 1024) for f in analyzer.files_data if f.size > 0]
-        
-        # Log scale for wide distribution
-        log_sizes = [math.log10(s) if s > 0 else 0 for s in sizes_mb]
+        # Get file sizes in MB for better visualization, on a log scale for wide distribution
+        sizes = analyzer.table.column('sizes')
+        if NUMPY_AVAILABLE:
+            np = _numpy()
+            log_sizes = np.log10(sizes[sizes > 0] / (1024 * 1024))
+        else:
+            log_sizes = [math.log10(size / (1024 * 1024)) for size in sizes if size > 0]
         
         ax2.hist(log_sizes, bins=50, alpha=0.7, color='skyblue', edgecolor='black')
         ax2.set_xlabel('File Size (log10 MB)', fontsize=12)
@@ -737,7 +1585,7 @@ def create_visualizations(analyzer: FileSystemAnalyzer, output_dir: str = "visua
     fig3, ax3 = plt.subplots(figsize=(12, 6))
     
     extensions = analyzer.stats.extensions
-    sorted_ext = sorted(extensions.items(), key=lambda x: x[1], reverse=True)[:10]
+    sorted_ext = heapq.nlargest(10, extensions.items(), key=itemgetter(1))
     
     ext_names = [ext[0] if ext[0] else '<no ext>' for ext in sorted_ext]
     ext_counts = [ext[1] for ext in sorted_ext]
@@ -783,6 +1631,15 @@ Examples:
                        default='standard', help='Analysis mode (default: standard)')
     parser.add_argument('--output', '-o', help='Output JSON file for results')
     parser.add_argument('--export-csv', help='Export file data to CSV')
+    parser.add_argument('--integrity-hashes', action='store_true',
+                       help='Also compute MD5 and SHA-256 for each file')
+    parser.add_argument('--hash-cache', action='store_true',
+                       help=f'Reuse hashes of unchanged files across runs '
+                            f'(stored in {FileSystemAnalyzer.HASH_CACHE_NAME} under the analyzed path)')
+    parser.add_argument('--cross-device', action='store_true',
+                       help='Descend into directories on other filesystems (mount points)')
+    parser.add_argument('--statx', action='store_true',
+                       help='Stat files with cached statx() attributes (Linux; speeds up network filesystems)')
     parser.add_argument('--visualize', '-v', action='store_true',
                        help='Generate visualizations')
     parser.add_argument('--quiet', '-q', action='store_true',
@@ -800,7 +1657,15 @@ Examples:
         sys.exit(1)
     
     # Create analyzer
-    analyzer = FileSystemAnalyzer(args.path, AnalysisMode(args.mode))
+    hash_cache = None
+    if args.hash_cache:
+        hash_cache = os.path.join(args.path, FileSystemAnalyzer.HASH_CACHE_NAME)
+    
+    analyzer = FileSystemAnalyzer(args.path, AnalysisMode(args.mode),
+                                  integrity_hashes=args.integrity_hashes,
+                                  hash_cache=hash_cache,
+                                  cross_device=args.cross_device,
+                                  use_statx=args.statx)
     analyzer._start_time = time.time()
     
     # Run analysis
@@ -817,32 +1682,32 @@ Examples:
     if args.visualize:
         create_visualizations(analyzer)
     
-    # Summary
+    # Summary, written in one piece
     if not args.quiet:
-        print("\n" + "=" * 60)
-        print("ANALYSIS COMPLETE")
-        print("=" * 60)
+        lines = ["\n" + "=" * 60, "ANALYSIS COMPLETE", "=" * 60]
         
         # Space wasted by duplicates
         if analyzer.duplicates:
-            wasted_space = sum(dup.size * (dup.count - 1) for dup in analyzer.duplicates)
+            wasted_space = analyzer._duplicate_wasted_space()
             wasted_str = analyzer._format_size(wasted_space)
-            print(f"💾 Potential space savings: {wasted_str} (by removing duplicates)")
+            lines.append(f"💾 Potential space savings: {wasted_str} (by removing duplicates)")
         
         # Recommendations
-        print("\n💡 RECOMMENDATIONS:")
+        lines.append("\n💡 RECOMMENDATIONS:")
         
         if analyzer.stats.total_size > 10 * 1024**3:  # > 10GB
-            print("  • Consider archiving old files")
+            lines.append("  • Consider archiving old files")
         
         if len(analyzer.duplicates) > 10:
-            print("  • Many duplicate files found - consider cleanup")
+            lines.append("  • Many duplicate files found - consider cleanup")
         
         if analyzer.stats.file_types.get('Temporary', 0) > 100:
-            print("  • High number of temporary files - consider cleanup")
+            lines.append("  • High number of temporary files - consider cleanup")
         
         if analyzer.errors:
-            print(f"  • {len(analyzer.errors)} access errors - check permissions")
+            lines.append(f"  • {len(analyzer.errors)} access errors - check permissions")
+        
+        analyzer._write_lines(lines)
     
     return 0
 